@@ -1,118 +1,125 @@
 import pandas as pd
-import json
+import orjson
 import os
 from pathlib import Path
 import re
+import logging
+
+log = logging.getLogger(__name__)
+
+# Placeholder copy in the Excel sheet that should never be matched
+_SKIP_PHRASES = frozenset({'[video]', 'enter copy', 'content/copy en'})
 
 def read_excel_file(file_path):
     """Read the Excel file and return a DataFrame."""
     try:
-        # Read the Excel file with the first row as header
-        df = pd.read_excel(file_path)
-        print("\nRaw Excel data preview:")
-        print(df.head(20))  # Show more rows for debugging
+        # Read only the first two columns as strings, with the first row as header
+        df = pd.read_excel(file_path, engine='openpyxl', usecols=[0, 1], dtype=str)
+        log.debug("Raw Excel data preview:\n%s", df.head(20))
         
-        # Keep all columns
-        df = df.iloc[:, [0, 1]]  # Only keep the first two columns
         df.columns = ['English', 'Translation']
         
         # Remove rows where English is NaN or empty
         df = df.dropna(subset=['English'])
-        df = df[df['English'].astype(str).str.strip() != '']
+        df = df[df['English'].str.strip() != '']
         
-        # Convert to string and strip whitespace
-        df['English'] = df['English'].astype(str).str.strip()
-        df['Translation'] = df['Translation'].fillna('').astype(str).str.strip()
+        # Strip whitespace
+        df['English'] = df['English'].str.strip()
+        df['Translation'] = df['Translation'].fillna('').str.strip()
         
         return df
     except Exception as e:
-        print(f"Error reading Excel file: {e}")
+        log.error("Error reading Excel file: %s", e)
         return None
 
 def load_source_json(file_path):
     """Load the source JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            print("\nSource JSON values:")
-            for key, value in data.items():
-                print(f"{key}: {value}")
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Source JSON values:")
+                for key, value in data.items():
+                    log.debug("%s: %s", key, value)
             return data
     except Exception as e:
-        print(f"Error reading source JSON file: {e}")
+        log.error("Error reading source JSON file: %s", e)
         return None
 
-def find_matching_key(english_text, source_json):
-    """Find the matching key in source JSON for the given English text."""
-    if pd.isna(english_text):
-        return None
-        
-    english_text = str(english_text).strip()
-    if not english_text or english_text.lower() in ['[video]', 'enter copy', 'content/copy en']:
-        return None
-    
-    # First try exact match with values (replacing &nbsp; with space and removing <span> tags)
-    for key, value in source_json.items():
-        if isinstance(value, str):
-            normalized_value = value.replace('&nbsp;', ' ').replace('<span>', '').replace('</span>', '')
-            normalized_english = english_text.replace('<span>', '').replace('</span>', '')
-            if normalized_value == normalized_english:
-                print(f"Found exact match for '{english_text}' with key '{key}'")
-                return key
-    
-    # If no exact match, try case-insensitive match
+def normalize_value(value):
+    """Normalize text for comparison (&nbsp; to space, drop <span> tags)."""
+    return value.replace('&nbsp;', ' ').replace('<span>', '').replace('</span>', '')
+
+def build_index(source_json):
+    """Build (exact_map, ci_map) mapping normalized source values to their keys."""
+    # setdefault keeps the first key on collisions
+    exact_map = {}
+    ci_map = {}
     for key, value in source_json.items():
         if isinstance(value, str):
-            normalized_value = value.replace('&nbsp;', ' ').replace('<span>', '').replace('</span>', '').lower()
-            normalized_english = english_text.replace('<span>', '').replace('</span>', '').lower()
-            if normalized_value == normalized_english:
-                print(f"Found case-insensitive match for '{english_text}' with key '{key}'")
-                return key
-    
-    print(f"No match found for '{english_text}'")
-    return None
+            normalized_value = normalize_value(value)
+            exact_map.setdefault(normalized_value, key)
+            ci_map.setdefault(normalized_value.lower(), key)
+    return exact_map, ci_map
 
 def process_translations(df, source_json):
     """Process the DataFrame and create a translation dictionary."""
     translations = source_json.copy()  # Start with the source JSON structure
-    updated_count = 0
     
-    for _, row in df.iterrows():
-        english_text = row['English']
-        translation = row['Translation']
-        
-        # Skip if either field is empty
-        if pd.isna(english_text) or pd.isna(translation):
-            continue
-            
-        english_text = str(english_text).strip()
-        translation = str(translation).strip()
-        
-        if not english_text or not translation or translation.lower() == 'nan':
-            continue
-            
-        # Find the matching key in source JSON
-        key = find_matching_key(english_text, source_json)
-        if key:
-            # Replace spaces with &nbsp; in the translation if the original had &nbsp;
-            if '&nbsp;' in source_json[key]:
-                translation = translation.replace(' ', '&nbsp;')
-            
-            translations[key] = translation
-            print(f"Updated translation for '{english_text}' to '{translation}'")
-            updated_count += 1
-    
-    print(f"\nTotal translations updated: {updated_count}")
+    exact_map, ci_map = build_index(source_json)
+    nbsp_keys = frozenset(k for k, v in source_json.items() if isinstance(v, str) and '&nbsp;' in v)
+    
+    # read_excel_file already returns stripped strings with empty English rows
+    # removed; skip rows with no translation and placeholder English copy
+    english = df['English']
+    translation_col = df['Translation']
+    mask = (
+        (translation_col.str.len() > 0)
+        & (translation_col.str.lower() != 'nan')
+        & ~english.str.lower().isin(_SKIP_PHRASES)
+    )
+    
+    english = english[mask]
+    translation_col = translation_col[mask]
+    
+    # Normalize the English copy and look up keys as whole columns, falling
+    # back to the case-insensitive map where there is no exact match
+    normalized = english.map(normalize_value)
+    exact_keys = normalized.map(exact_map)
+    keys = exact_keys.where(exact_keys.notna(), normalized.str.lower().map(ci_map))
+    matched = keys.notna()
+    
+    # Replace spaces with &nbsp; in the translation if the original had &nbsp;
+    translation_col = translation_col.where(
+        ~keys.isin(nbsp_keys), translation_col.str.replace(' ', '&nbsp;', regex=False)
+    )
+    
+    if log.isEnabledFor(logging.DEBUG):
+        for english_text, key, is_exact, translation in zip(english, keys, exact_keys.notna(), translation_col):
+            if pd.isna(key):
+                log.debug("No match found for '%s'", english_text)
+            else:
+                log.debug("Found %s match for '%s' with key '%s', updated translation to '%s'",
+                          'exact' if is_exact else 'case-insensitive', english_text, key, translation)
+    
+    keys = keys[matched]
+    translation_col = translation_col[matched]
+    
+    # Later rows win for duplicate keys, as with row-by-row assignment
+    translations.update(zip(keys, translation_col))
+    updated_count = len(keys)
+    
+    log.info("Total translations updated: %d", updated_count)
     return translations
 
 def save_to_json(translations, output_path):
     """Save translations to a JSON file."""
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(translations, f, ensure_ascii=False, indent=4)
-        print(f"Translations saved to {output_path}")
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(translations, option=orjson.OPT_INDENT_2))
+        log.info("Translations saved to %s", output_path)
     except Exception as e:
-        print(f"Error saving JSON file: {e}")
+        log.error("Error saving JSON file: %s", e)
 
 def main():
     # Get the current directory
@@ -127,27 +134,20 @@ def main():
     export_dir.mkdir(exist_ok=True)
     
     # Clean up exportCode directory
-    print("\nCleaning up exportCode directory...")
-    for file in export_dir.glob('*'):
-        if file.is_file():
-            file.unlink()
-            print(f"Removed {file.name}")
+    log.info("Cleaning up exportCode directory...")
+    with os.scandir(export_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                os.unlink(entry.path)
     
     # Set up output paths
     output_json_path = export_dir / 'translations.json'
     
     # Check if required files exist
-    if not excel_path.exists():
-        print(f"Error: Excel file not found at {excel_path}")
-        return
-    
-  
-    if not source_json_path.exists():
-        print(f"Error: Source JSON file not found at {source_json_path}")
-        return
-    
-  
-   
+    for path, label in [(excel_path, 'Excel file'), (source_json_path, 'Source JSON file')]:
+        if not path.exists():
+            log.error("Error: %s not found at %s", label, path)
+            return
     
     # Load source JSON
     source_json = load_source_json(source_json_path)
@@ -163,4 +163,8 @@ def main():
   
 
 if __name__ == "__main__":
+    level = logging.getLevelName(os.environ.get('LOGLEVEL', 'INFO').upper())
+    if not isinstance(level, int):
+        level = logging.INFO  # Unknown level name
+    logging.basicConfig(level=level, format='%(message)s')
     main() 
\ No newline at end of file